@@ -1,7 +1,17 @@
+import atexit
+import concurrent.futures
+import copy
+import functools
+import gzip
+import hashlib
 import json
 import os
+import queue
+import re
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from io import StringIO
 
 from flask import Flask, jsonify, request, Response
@@ -10,11 +20,36 @@ from ruamel.yaml.comments import CommentedMap
 
 try:
     from jinja2 import Environment, FileSystemLoader, StrictUndefined
+    from jinja2 import meta as jinja2_meta
 except Exception:
     Environment = None  # type: ignore
+    jinja2_meta = None  # type: ignore
     FileSystemLoader = None  # type: ignore
     StrictUndefined = None  # type: ignore
 
+# Optional: PyYAML (libyaml C bindings when available) for fast read-only parsing
+try:
+    import yaml as pyyaml
+    try:
+        from yaml import CSafeLoader as _PySafeLoader
+    except ImportError:
+        from yaml import SafeLoader as _PySafeLoader
+except Exception:
+    pyyaml = None  # type: ignore
+    _PySafeLoader = None  # type: ignore
+
+# Optional: orjson for faster JSON responses
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+# Optional: response compression (gzip/brotli/zstd) for large JSON payloads
+try:
+    from flask_compress import Compress
+except Exception:
+    Compress = None  # type: ignore
+
 # Optional: native file dialogs for local use
 try:
     import tkinter as _tk
@@ -24,20 +59,78 @@ except Exception:
     _filedialog = None  # type: ignore
 
 app = Flask(__name__)
+if Compress is not None:
+    # Bodies under COMPRESS_MIN_SIZE (500 bytes, e.g. /update acks) and the pre-gzipped page pass through
+    Compress(app)
 
 # === Configuration ===
 CONFIG_PATH = os.environ.get("ROCKIQ_CONFIG", "config.yml")
 LIBRARY_DIR = os.environ.get("ROCKIQ_LIBRARY", "library")
 
+# Limits for a single /update request
+MAX_UPDATE_BYTES = 1_000_000
+MAX_UPDATE_KEYS = 200
+
+# Vertical distance between consecutive nodes in the default (preset) layout
+NODE_VERTICAL_SPACING = 140
+
+# Serialized /graph payloads kept per parsed config (sequence/offset/limit combinations)
+GRAPH_MEMO_MAX = 32
+
+# Quiet period after the last /update before its edit is written to disk
+SAVE_DEBOUNCE_SECONDS = 0.25
+
+# Upper bound for /sequence/create_many
+MAX_BULK_SEQUENCES = 1000
+
 # Mutable current config path, switchable at runtime via API
 CURRENT_CONFIG_PATH = CONFIG_PATH
+# Absolute form of CURRENT_CONFIG_PATH, resolved once per switch rather than per request
+CURRENT_CONFIG_PATH_RESOLVED = str(Path(CONFIG_PATH).resolve())
 
 def get_config_path() -> str:
     return CURRENT_CONFIG_PATH
 
+def get_config_path_resolved() -> str:
+    return CURRENT_CONFIG_PATH_RESOLVED
+
 def set_config_path(path: str) -> None:
-    global CURRENT_CONFIG_PATH
+    global CURRENT_CONFIG_PATH, CURRENT_CONFIG_PATH_RESOLVED
     CURRENT_CONFIG_PATH = path
+    CURRENT_CONFIG_PATH_RESOLVED = str(Path(path).resolve())
+
+# Tk objects may only be used from the thread that created them, and requests arrive on arbitrary
+# worker threads. All dialogs therefore run on one long-lived thread that owns a single hidden
+# Tk root, created on first use and reused afterwards instead of re-initializing Tcl per dialog.
+_DIALOG_JOBS: "queue.Queue[Tuple[Any, Dict[str, Any], concurrent.futures.Future]]" = queue.Queue()
+_DIALOG_THREAD: Optional[threading.Thread] = None
+_DIALOG_THREAD_LOCK = threading.Lock()
+
+def _dialog_worker() -> None:
+    root = None
+    while True:
+        fn, kwargs, fut = _DIALOG_JOBS.get()
+        try:
+            if root is None:
+                root = _tk.Tk()
+                root.withdraw()
+                try:
+                    root.attributes("-topmost", True)
+                except Exception:
+                    pass
+            fut.set_result(fn(parent=root, **kwargs))
+        except Exception as e:
+            fut.set_exception(e)
+
+def _run_dialog(fn: Any, **kwargs: Any) -> str:
+    global _DIALOG_THREAD
+    with _DIALOG_THREAD_LOCK:
+        if _DIALOG_THREAD is None or not _DIALOG_THREAD.is_alive():
+            _DIALOG_THREAD = threading.Thread(target=_dialog_worker, name="file-dialogs", daemon=True)
+            _DIALOG_THREAD.start()
+    fut: concurrent.futures.Future = concurrent.futures.Future()
+    _DIALOG_JOBS.put((fn, kwargs, fut))
+    return fut.result() or ""
 
 def _open_file_dialog(initial_dir: str = "", title: str = "Open file") -> str:
     """
@@ -47,22 +140,12 @@ def _open_file_dialog(initial_dir: str = "", title: str = "Open file") -> str:
     if _tk is None or _filedialog is None:
         return ""
     try:
-        root = _tk.Tk()
-        root.withdraw()
-        try:
-            root.attributes("-topmost", True)
-        except Exception:
-            pass
-        path = _filedialog.askopenfilename(
+        return _run_dialog(
+            _filedialog.askopenfilename,
             title=title,
             initialdir=initial_dir or str(Path.cwd()),
             filetypes=[("YAML files", "*.yml *.yaml"), ("All files", "*.*")]
         )
-        try:
-            root.destroy()
-        except Exception:
-            pass
-        return path or ""
     except Exception:
         return ""
 
@@ -70,24 +153,14 @@ def _save_file_dialog(initial_dir: str = "", initial_file: str = "config.yml", t
     if _tk is None or _filedialog is None:
         return ""
     try:
-        root = _tk.Tk()
-        root.withdraw()
-        try:
-            root.attributes("-topmost", True)
-        except Exception:
-            pass
-        path = _filedialog.asksaveasfilename(
+        return _run_dialog(
+            _filedialog.asksaveasfilename,
             title=title,
             initialdir=initial_dir or str(Path.cwd()),
             initialfile=initial_file,
             defaultextension=".yml",
             filetypes=[("YAML files", "*.yml *.yaml"), ("All files", "*.*")]
         )
-        try:
-            root.destroy()
-        except Exception:
-            pass
-        return path or ""
     except Exception:
         return ""
 
@@ -95,8 +168,59 @@ yaml = YAML()
 yaml.preserve_quotes = True
 yaml.width = 4096  # avoid line wraps for long inline structures
 
+# Plain dicts/lists without round-trip metadata, for read-only paths when PyYAML is unavailable
+yaml_safe = YAML(typ="safe")
+
+if _PySafeLoader is not None:
+    class _FastLoader(_PySafeLoader):  # type: ignore[misc, valid-type]
+        """
+        PyYAML safe loader that resolves plain scalars like ruamel's YAML 1.2 loader,
+        so 'yes'/'on'/'12:30' stay strings and '017' stays decimal on the read path.
+        """
+
+    def _construct_yaml12_int(loader: Any, node: Any) -> int:
+        value = loader.construct_scalar(node).replace("_", "")
+        if value.lstrip("+-")[:2].lower() in ("0b", "0o", "0x"):
+            return int(value, 0)
+        return int(value, 10)
+
+    _YAML11_TAGS = ("tag:yaml.org,2002:bool", "tag:yaml.org,2002:int", "tag:yaml.org,2002:float")
+    _FastLoader.yaml_implicit_resolvers = {
+        ch: [(tag, rx) for tag, rx in resolvers if tag not in _YAML11_TAGS]
+        for ch, resolvers in _PySafeLoader.yaml_implicit_resolvers.items()
+    }
+    _FastLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:bool",
+        re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"),
+        list("tTfF"))
+    _FastLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:int",
+        re.compile(r"^(?:[-+]?0b[0-1_]+|[-+]?0o[0-7_]+|[-+]?[0-9_]+|[-+]?0x[0-9a-fA-F_]+)$"),
+        list("-+0123456789"))
+    _FastLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:float",
+        re.compile(r"""^(?:[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+                    |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+                    |[-+]?\.[0-9_]+(?:[eE][-+]?[0-9]+)?
+                    |[-+]?\.(?:inf|Inf|INF)
+                    |\.(?:nan|NaN|NAN))$""", re.X),
+        list("-+0123456789."))
+    _FastLoader.add_constructor("tag:yaml.org,2002:int", _construct_yaml12_int)
+else:
+    _FastLoader = None  # type: ignore
+
 # ---------- YAML helpers ----------
 
+# Start of any Jinja construct: '{{', '{%' or '{#'
+_JINJA_MARK_RE = re.compile(r"\{[{%#]")
+
+@functools.lru_cache(maxsize=16)
+def _jinja_env(base_dir: str) -> Any:
+    # One Environment per config directory: keeps Jinja's template cache for {% include %}d files
+    # instead of rebuilding the environment on every parse. Jinja reloads a cached template when
+    # its file changes; _cached_docs watches the same files via _jinja_includes.
+    return Environment(loader=FileSystemLoader(base_dir), undefined=StrictUndefined, autoescape=False)
+
 def render_jinja_text(raw_text: str, base_dir: Path) -> str:
     """
     Render Jinja templates in YAML text using environment variables and basic context.
@@ -106,13 +230,14 @@ def render_jinja_text(raw_text: str, base_dir: Path) -> str:
       - file_dir: directory of the YAML file
       - cwd: current working directory
     """
-    if Environment is None:
+    # Plain YAML (the common case) needs no Jinja pass at all
+    if Environment is None or not _JINJA_MARK_RE.search(raw_text):
         return raw_text
     try:
-        env = Environment(loader=FileSystemLoader(str(base_dir)), undefined=StrictUndefined, autoescape=False)
-        template = env.from_string(raw_text)
+        template = _jinja_env(str(base_dir)).from_string(raw_text)
         context = {
-            "env": dict(os.environ),
+            # os.environ is a mapping already; no need to copy every variable per render
+            "env": os.environ,
             "file_dir": str(base_dir),
             "cwd": str(Path.cwd()),
         }
@@ -121,23 +246,310 @@ def render_jinja_text(raw_text: str, base_dir: Path) -> str:
         # Best-effort fallback preserves original file if rendering fails
         return raw_text
 
-def load_all_docs(path: str) -> List[CommentedMap]:
-    p = Path(path)
-    if not p.exists():
+def _jinja_includes(raw_text: str, base_dir: Path) -> Tuple[Path, ...]:
+    """
+    Files a config template pulls in through {% include %}, {% import %} or {% extends %},
+    followed recursively. Only literal template names can be resolved; computed ones are skipped.
+    """
+    if Environment is None or not _JINJA_MARK_RE.search(raw_text):
+        return ()
+    env = _jinja_env(str(base_dir))
+    found: Dict[str, Path] = {}
+    sources = [raw_text]
+    while sources:
+        try:
+            names = jinja2_meta.find_referenced_templates(env.parse(sources.pop()))
+        except Exception:
+            continue
+        for name in names:
+            if name is None or name in found:
+                continue
+            try:
+                source, filename, _ = env.loader.get_source(env, name)
+            except Exception:
+                continue
+            found[name] = Path(filename)
+            sources.append(source)
+    return tuple(found.values())
+
+# Parsed YAML keyed by (loader, path); an entry is reused while (st_mtime_ns, st_size) match.
+# For Jinja configs the stamp also covers their included files (see _with_includes).
+# The trailing dict memoizes data derived from that docs list (lookup tables, serialized graphs),
+# filled lazily on first use and dropped together with the entry.
+_DOC_CACHE: Dict[Tuple[str, str], Tuple[int, int, List[Any], Dict[str, Any]]] = {}
+# Included template files of each cached Jinja config, same keys as _DOC_CACHE
+_DOC_INCLUDES: Dict[Tuple[str, str], Tuple[Path, ...]] = {}
+# Guards _DOC_CACHE and the config file itself. Reentrant so writers can hold it across
+# their whole load -> mutate -> save cycle while the loaders take it again inside.
+_DOCS_LOCK = threading.RLock()
+
+def reset_caches() -> None:
+    """Forget all memoized parses, e.g. after files were edited behind the app's back."""
+    with _DOCS_LOCK:
+        _flush_pending_saves()
+        _DOC_CACHE.clear()
+        _DOC_INCLUDES.clear()
+
+def _file_stamp(p: Path) -> Tuple[int, int]:
+    try:
+        st = p.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Config file not found: {p.resolve()}")
-    text = p.read_text(encoding="utf-8")
-    rendered = render_jinja_text(text, p.parent)
-    docs = list(yaml.load_all(StringIO(rendered)))
+    return st.st_mtime_ns, st.st_size
+
+def _with_includes(stamp: Tuple[int, int], includes: Tuple[Path, ...]) -> Tuple[int, int]:
+    # Newest mtime and total size over the config and its includes, so editing an included file
+    # invalidates the parse (and the ETags derived from it) just like editing the config itself
+    mtime_ns, size = stamp
+    for inc in includes:
+        try:
+            st = inc.stat()
+        except OSError:
+            size -= 1  # a vanished include must change the stamp too
+            continue
+        mtime_ns = max(mtime_ns, st.st_mtime_ns)
+        size += st.st_size
+    return mtime_ns, size
+
+def _cached_docs(path: str, kind: str) -> List[Any]:
+    p = Path(path)
+    key = (kind, os.path.abspath(path))
+    # Parse under the lock: concurrent requests for a stale file wait for one parse
+    # instead of each re-reading and re-parsing it
+    with _DOCS_LOCK:
+        file_stamp = _file_stamp(p)
+        stamp = _with_includes(file_stamp, _DOC_INCLUDES.get(key, ()))
+        cached = _DOC_CACHE.get(key)
+        if cached is not None and cached[:2] == stamp:
+            return cached[2]
+        text = p.read_text(encoding="utf-8")
+        # Stamp the includes before rendering reads them, so an edit racing the render re-parses
+        includes = _jinja_includes(text, p.parent)
+        if includes:
+            _DOC_INCLUDES[key] = includes
+            stamp = _with_includes(file_stamp, includes)
+        else:
+            _DOC_INCLUDES.pop(key, None)
+        # Without Jinja markers this is `text` itself; every loader parses the str directly, no copy
+        rendered = render_jinja_text(text, p.parent)
+        if kind == "fast" and _FastLoader is not None:
+            docs = list(pyyaml.load_all(rendered, Loader=_FastLoader))
+        elif kind == "fast":
+            docs = list(yaml_safe.load_all(rendered))
+        else:
+            docs = list(yaml.load_all(rendered))
+        _DOC_CACHE[key] = (stamp[0], stamp[1], docs, {})
+        return docs
+
+def _doc_entry(docs: List[Any]) -> Optional[Tuple[int, int, List[Any], Dict[str, Any]]]:
+    """Cache entry holding a shared docs list, or None for private copies."""
+    with _DOCS_LOCK:
+        for entry in _DOC_CACHE.values():
+            if entry[2] is docs:
+                return entry
+    return None
+
+def _doc_memo(docs: List[Any]) -> Optional[Dict[str, Any]]:
+    """Memo dict of a cached (shared) docs list, or None for private copies."""
+    entry = _doc_entry(docs)
+    return entry[3] if entry is not None else None
+
+def load_all_docs(path: str) -> List[CommentedMap]:
+    # Callers mutate and save the result; hand out a copy so the cached tree stays pristine.
+    # Copy under the lock: /update edits the cached tree in place.
+    with _DOCS_LOCK:
+        _flush_pending_saves()
+        return copy.deepcopy(_cached_docs(path, "rt"))
+
+def _edit_docs_in_place(path: str) -> List[CommentedMap]:
+    """
+    The cached round-trip tree itself, for small edits persisted via save_doc or schedule_save.
+    Caller must hold _DOCS_LOCK, and roll back an edit that fails halfway (see _undo_node_updates)
+    so the tree, which may still carry earlier edits waiting to be saved, is never saved half-edited.
+    Pending debounced saves are not flushed here, so consecutive edits share one write.
+    The tree is edited only until it is written: the save replaces it in the cache with a fresh
+    parse of the written text, which the next edit or load starts from.
+    """
+    docs = _cached_docs(path, "rt")
+    pending = _PENDING_SAVES.get(path)
+    if pending is not None and pending[0] is not docs:
+        # File changed behind a pending save; write the acknowledged edits before editing further
+        _flush_pending_saves()
+        docs = _cached_docs(path, "rt")
     return docs
 
+def _forget_docs(path: str) -> None:
+    with _DOCS_LOCK:
+        # Edits already acknowledged to clients still go to disk before the tree is dropped
+        _flush_pending_saves()
+        _DOC_CACHE.pop(("rt", os.path.abspath(path)), None)
+
+def load_all_docs_fast(path: str) -> List[Any]:
+    """
+    Read-only variant of load_all_docs returning plain dicts/lists.
+    Uses PyYAML's libyaml-backed loader, or ruamel's safe loader if PyYAML is missing.
+    Do not write the result back with save_all_docs: comments and quoting are not preserved.
+    The returned list is shared between requests and must not be mutated.
+    """
+    with _DOCS_LOCK:
+        # Readers must see edits that are still waiting for their debounced write
+        _flush_pending_saves()
+        return _cached_docs(path, "fast")
+
+def _write_text_atomic(path: str, text: str) -> None:
+    # Write a sibling temp file and swap it in, so a crash mid-write never leaves a truncated config
+    tmp = f"{path}.tmp"
+    try:
+        Path(tmp).write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def _reseed_saved(path: str, text: str) -> None:
+    # Dumping a ruamel tree moves its comment/blank-line tokens around, so a tree that has been
+    # written must never be dumped (or copied and dumped) again. Cache a fresh parse of the text
+    # just written instead, so the next edit doesn't re-read the file.
+    key = ("rt", os.path.abspath(path))
+    with _DOCS_LOCK:
+        _DOC_CACHE.pop(key, None)
+        _DOC_INCLUDES.pop(key, None)
+        if _JINJA_MARK_RE.search(text):
+            # A load would render this text first; leave that to _cached_docs
+            return
+        try:
+            stamp = _file_stamp(Path(path))
+            docs = list(yaml.load_all(text))
+        except Exception:
+            return
+        _DOC_CACHE[key] = (stamp[0], stamp[1], docs, {})
+
+def _serialized(fn):
+    """Run a config-editing endpoint under _DOCS_LOCK so concurrent edits can't overwrite each other."""
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _DOCS_LOCK:
+            return fn(*args, **kwargs)
+    return wrapper
+
 def save_all_docs(path: str, docs: List[CommentedMap]) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump_all(docs, f)
+    # Emit into memory first so a failed dump leaves the file untouched
+    buf = StringIO()
+    yaml.dump_all(docs, buf)
+    text = buf.getvalue()
+    _write_text_atomic(path, text)
+    _reseed_saved(path, text)
+
+# Document start marker on a line of its own ('---', optionally followed by a comment)
+_DOC_START_RE = re.compile(r"^---[ \t]*(?:#[^\n]*)?\n", re.M)
+
+def save_doc(path: str, docs: List[CommentedMap], doc_idx: int) -> None:
+    """
+    Persist a change that only touched docs[doc_idx]: re-emit that one document and splice it
+    into the file text between its '---' markers, leaving every other document byte-for-byte as is.
+    Falls back to save_all_docs whenever the file layout can't be matched to docs safely
+    (Jinja templates, unexpected document count, section name not where expected).
+    """
+    p = Path(path)
+    try:
+        text = p.read_text(encoding="utf-8")
+    except OSError:
+        text = ""
+    if not text or _JINJA_MARK_RE.search(text):
+        save_all_docs(path, docs)
+        return
+
+    bounds = [0] + [m.start() for m in _DOC_START_RE.finditer(text)] + [len(text)]
+    chunks = [text[a:b] for a, b in zip(bounds, bounds[1:])]
+    # Blank lines/comments before the first marker don't form a document of their own
+    prefix = ""
+    if not any(ln.strip() and not ln.lstrip().startswith("#") for ln in chunks[0].splitlines()):
+        prefix = chunks.pop(0)
+    doc = docs[doc_idx]
+    name = doc.get("section") if isinstance(doc, dict) else None
+    if len(chunks) != len(docs) or (isinstance(name, str) and not re.search(
+            rf"(?m)^section:[ \t]*['\"]?{re.escape(name)}['\"]?[ \t]*(?:#.*)?$", chunks[doc_idx])):
+        save_all_docs(path, docs)
+        return
+
+    buf = StringIO()
+    yaml.dump_all([doc], buf)
+    dumped = buf.getvalue()
+    marker = _DOC_START_RE.match(chunks[doc_idx])
+    if marker:
+        emitted = _DOC_START_RE.match(dumped)
+        if emitted:
+            dumped = dumped[emitted.end():]
+        dumped = marker.group(0) + dumped
+    chunks[doc_idx] = dumped
+    text = prefix + "".join(chunks)
+    _write_text_atomic(path, text)
+    _reseed_saved(path, text)
+
+# Debounced write-back for in-place edits: path -> (docs, indices of touched documents).
+# A burst of /update calls (typing, repeated blur events) ends up as one write.
+_PENDING_SAVES: Dict[str, Tuple[List[CommentedMap], set]] = {}
+_SAVE_TIMER: Optional[threading.Timer] = None
+
+def schedule_save(path: str, docs: List[CommentedMap], doc_idx: int) -> None:
+    """
+    Persist docs[doc_idx] after SAVE_DEBOUNCE_SECONDS without further edits.
+    docs must be the cached tree (see _edit_docs_in_place); caller holds _DOCS_LOCK.
+    Reads through load_all_docs/load_all_docs_fast flush first, so nothing stale is served,
+    and structural edits copy a fresh parse rather than the tree that was just dumped.
+    """
+    global _SAVE_TIMER
+    pending = _PENDING_SAVES.get(path)
+    if pending is None or pending[0] is not docs:
+        if pending is not None:
+            _flush_pending_saves()
+        pending = _PENDING_SAVES[path] = (docs, set())
+    pending[1].add(doc_idx)
+    if _SAVE_TIMER is not None:
+        _SAVE_TIMER.cancel()
+    _SAVE_TIMER = threading.Timer(SAVE_DEBOUNCE_SECONDS, _flush_pending_saves)
+    _SAVE_TIMER.daemon = True
+    _SAVE_TIMER.start()
+
+def _flush_pending_saves() -> None:
+    global _SAVE_TIMER
+    with _DOCS_LOCK:
+        if _SAVE_TIMER is not None:
+            _SAVE_TIMER.cancel()
+            _SAVE_TIMER = None
+        while _PENDING_SAVES:
+            path, (docs, touched) = _PENDING_SAVES.popitem()
+            try:
+                if len(touched) == 1:
+                    save_doc(path, docs, next(iter(touched)))
+                else:
+                    save_all_docs(path, docs)
+            except Exception:
+                # The edits can't reach disk; don't keep serving them from the cache
+                app.logger.exception("Saving %s failed; unsaved edits were discarded", path)
+                _forget_docs(path)
+
+atexit.register(_flush_pending_saves)
 
 def find_doc_by_section(docs: List[CommentedMap], section_name: str) -> Tuple[int, CommentedMap]:
-    for idx, d in enumerate(docs):
-        if isinstance(d, dict) and d.get("section") == section_name:
-            return idx, d
+    memo = _doc_memo(docs)
+    if memo is not None:
+        sections = memo.get("section_idx")
+        if sections is None:
+            sections = memo["section_idx"] = {}
+            for idx, d in enumerate(docs):
+                if isinstance(d, dict) and isinstance(d.get("section"), str):
+                    sections.setdefault(d["section"], idx)
+        idx = sections.get(section_name)
+        if idx is not None:
+            return idx, docs[idx]
+    else:
+        for idx, d in enumerate(docs):
+            if isinstance(d, dict) and d.get("section") == section_name:
+                return idx, d
     raise KeyError(f"Section '{section_name}' not found in YAML.")
 
 def get_sequences(seq_doc: CommentedMap) -> List[dict]:
@@ -146,139 +558,260 @@ def get_sequences(seq_doc: CommentedMap) -> List[dict]:
         raise ValueError("No sequences found in SequenceConfig.")
     return seqs
 
+def find_sequence(docs: List[CommentedMap], seqs: List[dict], seq_id: Any) -> Tuple[int, dict]:
+    """
+    Return (position, sequence) for the sequence whose 'id' matches seq_id (compared as strings).
+    Falls back to the first sequence if seq_id is None or not found.
+    """
+    if seq_id is not None:
+        memo = _doc_memo(docs)
+        if memo is not None:
+            by_id = memo.get("seq_idx")
+            if by_id is None:
+                by_id = memo["seq_idx"] = {}
+                for i, s in enumerate(seqs):
+                    by_id.setdefault(str(s.get("id")), i)
+            i = by_id.get(str(seq_id))
+            if i is not None:
+                return i, seqs[i]
+        else:
+            for i, s in enumerate(seqs):
+                if str(s.get("id")) == str(seq_id):
+                    return i, s
+    return 0, seqs[0]
+
+@functools.lru_cache(maxsize=4096)
+def _split_module_str(module_str: str) -> Tuple[str, str]:
+    # First token is the class, last token the function ('a.b.c' -> ('a', 'c')), no list built
+    head, sep, _ = module_str.partition(".")
+    if sep:
+        return sys.intern(head), sys.intern(module_str.rpartition(".")[2])
+    return "", sys.intern(head)
+
 def parse_module_class_func(module_str: str) -> Tuple[str, str]:
     """
     Split 'cAdvanced_PSD.Calculate_PSD' -> ('cAdvanced_PSD', 'Calculate_PSD')
     If no dot present: ('', same_str)
+    Tokens are interned: the same few class/function names repeat across many modules
+    and are used as dict keys while building the graph. Splits are memoized for the same reason.
     """
     if not isinstance(module_str, str):
         return "", str(module_str)
-    parts = module_str.split(".")
-    if len(parts) >= 2:
-        return parts[0], parts[-1]
-    return "", parts[0]
+    return _split_module_str(module_str)
 
-def build_graph_from_sequence(sequence: dict) -> dict:
+def build_graph_from_sequence(sequence: dict, window: Optional[Tuple[int, Optional[int]]] = None) -> dict:
     """
-    Returns elements for Cytoscape: {'nodes': [...], 'edges': [...]}
-    - nodes have data: {id, label, index, cls, func, full, params}
+    Returns elements for Cytoscape: {'nodes': [...], 'edges': [...], 'total': N}
+    - nodes have data: {id, label, index, cls, func, full, params} and a preset position {x, y}
     - edges have data: {id, source, target, label}
+    window=(start, end) only emits nodes for modules[start:end] and edges between them;
+    end=None means to the end. Outputs still count consumers after the window.
     """
     modules = sequence.get("module_sequence", [])
     if not isinstance(modules, list):
         raise ValueError("sequence.module_sequence must be a list.")
+    total = len(modules)
+    start, end = window if window is not None else (0, None)
+    start = max(0, start)
+    end = total if end is None else min(total, end)
     nodes = []
     edges = []
-    # Track discovered outputs for each node index
-    outputs_by_index: Dict[int, set] = {}
+    # Track discovered outputs for each node index; dicts act as insertion-ordered sets.
+    # Most modules have no outputs, so slots stay None until the first one is recorded.
+    outputs_by_index: List[Optional[Dict[str, None]]] = [None] * total
 
-    # Map function name -> list of indices where it appears
-    func_to_indices: Dict[str, List[int]] = {}
+    # Map function name -> latest index where it appears (only prior nodes while resolving refs)
+    func_to_last: Dict[str, int] = {}
     # Track most recent node index for each class to connect same-class modules
     cls_to_last_index: Dict[str, int] = {}
 
-    # First pass: create nodes
+    # Hot loop: bind bound methods and ids to locals once instead of looking them up per module
+    node_append = nodes.append
+    edge_append = edges.append
+    func_get = func_to_last.get
+    cls_get = cls_to_last_index.get
+    node_ids = [f"n{i}" for i in range(end)]
+
+    # Helper to resolve a reference to a prior node by function
+    def resolve_ref(ref_module: str) -> int:
+        """
+        Try exact function match, then suffix match (take last token after '.').
+        func_to_last only holds nodes before the one being built, so this is the latest prior index.
+        Return -1 if not found.
+        """
+        target = ref_module or ""
+        idx = func_get(target, -1)
+        # Suffix match on last token (e.g. 'cv2.read_image' -> 'read_image')
+        if idx < 0 and "." in target:
+            idx = func_get(target.rpartition(".")[2], -1)
+        return idx
+
+    # Single pass: create each node and its incoming edges; refs only ever point backwards.
+    # Modules before the window only register their func/class; later ones only add outputs.
     for i, mod in enumerate(modules):
         full = mod.get("module", "")
         cls, func = parse_module_class_func(full)
-        node_id = f"n{i}"
-        # Params shown in editor: everything except 'module'
-        params = {k: v for k, v in mod.items() if k != "module"}
-        label = f"{func}\n[{cls}]" if cls else func
-        nodes.append({
-            "data": {
-                "id": node_id,
-                "label": label,
-                "index": i,
-                "cls": cls,
-                "func": func,
-                "full": full,
-                "params": params,
-                "w": 190,
-                "h": 48,
-            }
-        })
-        func_to_indices.setdefault(func, []).append(i)
-
-        # Seed outputs with any explicit 'outputs' declared on the node
-        try:
-            explicit_outputs = mod.get("outputs", {})
-            if isinstance(explicit_outputs, dict):
-                outputs_by_index.setdefault(i, set()).update(list(explicit_outputs.keys()))
-        except Exception:
-            pass
+        in_window = start <= i < end
+
+        if in_window:
+            node_id = node_ids[i]
+            # Params shown in editor: everything except 'module' (C-level copy, then drop one key)
+            params = dict(mod)
+            params.pop("module", None)
+            label = f"{func}\n[{cls}]" if cls else func
+            node_append({
+                "data": {
+                    "id": node_id,
+                    "label": label,
+                    "index": i,
+                    "cls": cls,
+                    "func": func,
+                    "full": full,
+                    "params": params,
+                    "w": 190,
+                    "h": 48,
+                },
+                # Preset layout: a single column ordered by index
+                "position": {"x": 0, "y": i * NODE_VERTICAL_SPACING},
+            })
+
+            # Seed outputs with any explicit 'outputs' declared on the node
+            try:
+                explicit_outputs = mod.get("outputs", {})
+                if isinstance(explicit_outputs, dict) and explicit_outputs:
+                    # Consumers come later in the sequence, so this slot is still empty here
+                    outputs_by_index[i] = dict.fromkeys(explicit_outputs)
+            except Exception:
+                pass
 
-        # Create an edge between consecutive nodes of the same class
-        if cls:
-            prev_idx = cls_to_last_index.get(cls, -1)
-            if prev_idx >= 0:
-                edges.append({
+            # Create an edge between consecutive nodes of the same class
+            prev_idx = cls_get(cls, -1) if cls else -1
+            if prev_idx >= start:
+                edge_append({
                     "data": {
                         "id": f"sc{prev_idx}_{i}",
-                        "source": f"n{prev_idx}",
-                        "target": f"n{i}",
+                        "source": node_ids[prev_idx],
+                        "target": node_id,
                         "label": "",
                         "edge_type": "same_class",
                     }
                 })
-            cls_to_last_index[cls] = i
-
-    # Helper to resolve a reference to a prior node by function
-    def resolve_ref(current_idx: int, ref_module: str) -> int:
-        """
-        Try exact function match, then suffix match (take last token after '.'),
-        and pick the latest index < current_idx.
-        Return -1 if not found.
-        """
-        target = ref_module or ""
-        candidates: List[int] = []
-
-        # Exact function match
-        if target in func_to_indices:
-            candidates = [idx for idx in func_to_indices[target] if idx < current_idx]
 
-        # Suffix match on last token (e.g. 'cv2.read_image' -> 'read_image')
-        if not candidates and "." in target:
-            last = target.split(".")[-1]
-            if last in func_to_indices:
-                candidates = [idx for idx in func_to_indices[last] if idx < current_idx]
-
-        return max(candidates) if candidates else -1
-
-    # Second pass: create edges from ref_* params
-    for i, mod in enumerate(modules):
-        for k, v in mod.items():
-            if not isinstance(k, str) or not k.startswith("ref_"):
-                continue
-            if isinstance(v, dict):
-                ref_mod = v.get("module")
-                src_idx = resolve_ref(i, ref_mod)
-                if src_idx >= 0:
-                    edge_id = f"e{src_idx}_{i}_{k}"
-                    label = str(v.get("name", ""))  # output name
-                    edges.append({
+        if i >= start:
+            # Create edges from ref_* params; only dicts have module/name/order semantics
+            ref_items = [(k, v) for k, v in mod.items()
+                         if isinstance(k, str) and k[:4] == "ref_" and isinstance(v, dict)]
+            for k, v in ref_items:
+                src_idx = resolve_ref(v.get("module"))
+                if src_idx < start:
+                    continue
+                label = str(v.get("name", ""))  # output name
+                if in_window:
+                    edge_append({
                         "data": {
-                            "id": edge_id,
-                            "source": f"n{src_idx}",
-                            "target": f"n{i}",
+                            "id": f"e{src_idx}_{i}_{k}",
+                            "source": node_ids[src_idx],
+                            "target": node_id,
                             "label": label,
                             "edge_type": "input",
                         }
                     })
-                    # Record that the source node produces this output name
-                    if label:
-                        outputs_by_index.setdefault(src_idx, set()).add(label)
-            # if list/str etc., ignore—only dicts have module/name/order semantics
+                # Record that the source node produces this output name
+                if label:
+                    outs = outputs_by_index[src_idx]
+                    if outs is None:
+                        outs = outputs_by_index[src_idx] = {}
+                    outs[label] = None
+
+        # Register this node only after its own refs are resolved
+        if cls:
+            cls_to_last_index[cls] = i
+        func_to_last[func] = i
 
     # Attach outputs to node data
-    for i, node in enumerate(nodes):
-        outs = sorted(list(outputs_by_index.get(i, set())))
-        node.get("data", {}).update({"outputs": outs})
+    for i, node in enumerate(nodes, start):
+        # Declared outputs first, then consumed ones in the order they are first referenced
+        outs = outputs_by_index[i]
+        node["data"]["outputs"] = list(outs) if outs else []
 
-    return {"nodes": nodes, "edges": edges}
+    return {"nodes": nodes, "edges": edges, "total": total}
 
 # ---------- Type coercion for updates ----------
 
+# Characters a JSON text can start with (json.loads also accepts NaN/Infinity)
+_JSON_START = frozenset('{["-0123456789tfnNI')
+_NOT_JSON = object()
+_LONG_DIGITS_RE = re.compile(r"\d{19}")
+
+def _parse_json(s: str) -> Any:
+    """json.loads(s), or _NOT_JSON if s is not JSON. Skips the parser when the first char rules it out."""
+    if not s or s[0] not in _JSON_START:
+        return _NOT_JSON
+    # orjson rejects NaN/Infinity and reads integers beyond 64 bits as floats; leave those to json
+    if orjson is not None and not _LONG_DIGITS_RE.search(s):
+        try:
+            return orjson.loads(s)
+        except Exception:
+            pass
+    try:
+        return json.loads(s)
+    except Exception:
+        return _NOT_JSON
+
+def _coerce_json(s: str, old_val: Any) -> Any:
+    parsed = _parse_json(s)
+    if parsed is _NOT_JSON:
+        # fall through to string if not valid JSON
+        return s
+    # keep tuple shape if original was tuple
+    if isinstance(old_val, tuple) and isinstance(parsed, list):
+        return tuple(parsed)
+    return parsed
+
+_TRUTHY = frozenset(("true", "1", "yes", "on"))
+_FALSY = frozenset(("false", "0", "no", "off"))
+
+def _coerce_bool(s: str, old_val: Any) -> Any:
+    ls = s.lower()
+    if ls in _TRUTHY:
+        return True
+    if ls in _FALSY:
+        return False
+    return bool(s)
+
+def _coerce_int(s: str, old_val: Any) -> Any:
+    try:
+        return int(s, 10)
+    except Exception:
+        # maybe float -> int
+        try:
+            return int(float(s))
+        except Exception:
+            return old_val
+
+def _coerce_float(s: str, old_val: Any) -> Any:
+    try:
+        return float(s)
+    except Exception:
+        return old_val
+
+def _coerce_scalar(s: str, old_val: Any) -> Any:
+    # Try JSON for things like lists written by hand; otherwise keep the string
+    # (including things like "(255,255,255)" that you may want to keep)
+    parsed = _parse_json(s)
+    return s if parsed is _NOT_JSON else parsed
+
+# Handlers by type of the existing value; looked up along the MRO so ruamel's
+# ScalarInt/ScalarFloat/CommentedMap/CommentedSeq resolve to their builtin base
+_COERCERS = {
+    bool: _coerce_bool,
+    int: _coerce_int,
+    float: _coerce_float,
+    dict: _coerce_json,
+    list: _coerce_json,
+    tuple: _coerce_json,
+}
+
 def coerce_value(new_val: Any, old_val: Any) -> Any:
     """
     Convert string input from the UI back into the original type of old_val.
@@ -291,59 +824,60 @@ def coerce_value(new_val: Any, old_val: Any) -> Any:
         return new_val
 
     s = new_val.strip()
-
-    # Try to preserve explicit JSON if provided
-    if isinstance(old_val, (dict, list, tuple)):
-        try:
-            parsed = json.loads(s)
-            # keep tuple shape if original was tuple
-            if isinstance(old_val, tuple) and isinstance(parsed, list):
-                return tuple(parsed)
-            return parsed
-        except Exception:
-            # fall through to string if not valid JSON
-            return s
-
-    # Booleans
-    if isinstance(old_val, bool):
-        if s.lower() in ("true", "1", "yes", "on"):
-            return True
-        if s.lower() in ("false", "0", "no", "off"):
-            return False
-        return bool(s)
-
-    # Numbers
-    if isinstance(old_val, int):
-        try:
-            return int(s, 10)
-        except Exception:
-            # maybe float -> int
-            try:
-                return int(float(s))
-            except Exception:
-                return old_val
-    if isinstance(old_val, float):
+    for cls in type(old_val).__mro__:
+        handler = _COERCERS.get(cls)
+        if handler is not None:
+            return handler(s, old_val)
+    return _coerce_scalar(s, old_val)
+
+# ---------- JSON responses ----------
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback for values it does not handle natively (e.g. ruamel float scalars, sets)."""
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    return str(obj)
+
+def dumps_json(obj: Any) -> Any:
+    """
+    Serialize a response body. Uses orjson when installed, else Flask's JSON provider.
+    Keys are sorted either way so payloads match what jsonify produced.
+    Output is compact; like jsonify, it is only indented when the app runs in debug mode.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if app.debug:
+            option |= orjson.OPT_INDENT_2
         try:
-            return float(s)
-        except Exception:
-            return old_val
-
-    # Try JSON for things like lists written by hand
-    try:
-        parsed = json.loads(s)
-        return parsed
-    except Exception:
-        pass
+            return orjson.dumps(obj, default=_json_default, option=option)
+        except orjson.JSONEncodeError:
+            # orjson rejects integers wider than 64 bits (see _LONG_DIGITS_RE); json handles them
+            pass
+    return app.json.dumps(obj, indent=2 if app.debug else None)
 
-    # Strings (including things like "(255,255,255)" that you may want to keep)
-    return s
+def conditional_json(body: Any, docs: List[Any], *key: Any) -> Response:
+    """
+    JSON response derived from a cached docs list, validated by the file's (mtime, size) plus key.
+    Clients must revalidate (no-cache); an unchanged config answers If-None-Match with an empty 304.
+    """
+    resp = Response(body, mimetype="application/json")
+    entry = _doc_entry(docs)
+    if entry is not None:
+        tag = repr((get_config_path_resolved(), entry[0], entry[1]) + key)
+        resp.set_etag(hashlib.blake2b(tag.encode("utf-8"), digest_size=8).hexdigest())
+        resp.last_modified = entry[0] / 1e9
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
+
+def ojson(obj: Any) -> Response:
+    return Response(dumps_json(obj), mimetype="application/json")
 
 # ---------- Flask endpoints ----------
 
-@app.get("/")
-def index() -> Response:
-    # Simple inlined page with Cytoscape UI
-    html = """
+# Simple inlined page with Cytoscape UI, encoded once at import
+_INDEX_HTML = """
 <!doctype html>
 <html>
 <head>
@@ -544,10 +1078,22 @@ let currentNodeData = null; // its data blob
 let stagedLinks = []; // { source_index, source_func, output_name, target_index, target_key }
 let stagedAdds = []; // { staged_id, full, cls, func, params, dropY, outputs }
 let stagedAddCounter = 0;
-const VERTICAL_SPACING = 140;
-let library = { classToModules: {} };
+let library = { classToModules: {}, classFuncIndex: new Map() }; // classFuncIndex: cls -> Map(func -> module)
 let rightPanelMode = 'library'; // 'library' | 'PlantInfo' | 'ProjectConfig' | 'IOConfig'
 let stagedReorder = null; // array of existing node indices in new order
+let seqNameById = new Map(); // sequence id -> display name, filled by loadSequences
+
+// First module registered for cls/func, like classToModules[cls].find(m => m.func === func)
+function libraryModule(cls, func){
+  return library.classFuncIndex.get(cls)?.get(func);
+}
+function addLibraryModule(map, cls, m){
+  let byFunc = library.classFuncIndex.get(cls);
+  if (!byFunc) { byFunc = new Map(); library.classFuncIndex.set(cls, byFunc); }
+  if (byFunc.has(m.func)) return;
+  byFunc.set(m.func, m);
+  (map[cls] = map[cls] || []).push(m);
+}
 
 function escapeHtml(s) {
   return (s ?? '').toString()
@@ -560,10 +1106,13 @@ async function loadSequences() {
   const payload = await res.json();
   cfgNameEl.textContent = payload.config_path;
   seqSelect.innerHTML = '';
+  seqNameById = new Map();
   payload.sequences.forEach((s, idx) => {
     const opt = document.createElement('option');
+    const name = s.name ?? 'Sequence ' + s.id;
+    seqNameById.set(Number(s.id), name);
     opt.value = s.id;
-    opt.textContent = `${s.id} — ${s.name ?? 'Sequence ' + s.id}`;
+    opt.textContent = `${s.id} — ${name}`;
     if (currentSeqId == null && idx === 0) currentSeqId = s.id;
     seqSelect.appendChild(opt);
   });
@@ -608,20 +1157,16 @@ async function createSequence(kind){
 }
 
 async function createSequencesBulk(kind, count){
-  // Sequential calls for simplicity; could be batched server-side later
-  let lastId = null;
-  for (let i = 0; i < count; i++) {
-    const body = { kind, source_id: seqSelect.value ? Number(seqSelect.value) : null };
-    const res = await fetch('/sequence/create', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(body) });
+  try {
+    // One request for all copies: the config is loaded and saved once
+    const body = { kind, source_id: seqSelect.value ? Number(seqSelect.value) : null, count };
+    const res = await fetch('/sequence/create_many', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(body) });
     if (!res.ok) { alert('Create sequence failed: ' + await res.text()); return; }
     const payload = await res.json();
-    lastId = payload.new_id;
-  }
-  if (lastId != null) {
-    currentSeqId = lastId;
+    currentSeqId = payload.next_selected_id;
     await loadSequences();
     await loadGraph();
-  }
+  } catch (e) { alert('Create sequence failed: ' + e); }
 }
 
 function openBulkModal(kind){
@@ -667,7 +1212,6 @@ async function loadGraph() {
   }
 
   if (!cy) {
-    const verticalSpacing = VERTICAL_SPACING;
     cy = cytoscape({
       container: document.getElementById('cy'),
       elements,
@@ -680,13 +1224,8 @@ async function loadGraph() {
       motionBlurOpacity: 0.2,
       hideEdgesOnViewport: true,
       hideLabelsOnViewport: true,
-      layout: {
-        name: 'preset',
-        positions: function(node){
-          const idx = node.data('index') ?? 0;
-          return { x: 0, y: idx * verticalSpacing };
-        }
-      },
+      // Nodes arrive with their position already set by the server
+      layout: { name: 'preset' },
       style: [
         { selector: 'node',
           style: {
@@ -730,6 +1269,7 @@ async function loadGraph() {
     });
 
     cy.on('tap', 'node', onNodeTap);
+    cy.on('add remove', () => { nonStagedCache = null; });
     setupCyDnD();
     setupRightDrag();
     setupReorderDrag();
@@ -738,34 +1278,41 @@ async function loadGraph() {
     await fetchLibrary();
     buildLibraryFromCy();
   } else {
-    const verticalSpacing = VERTICAL_SPACING;
     cy.elements().remove();
     cy.add(elements);
-    // fallback layout to prevent invisible graph if indices missing
+    // fallback layout to prevent invisible graph if positions are missing
     try {
-      cy.layout({
-        name: 'preset',
-        positions: function(node){
-          const idx = node.data('index') ?? 0;
-          return { x: 0, y: idx * verticalSpacing };
-        }
-      }).run();
+      cy.layout({ name: 'preset' }).run();
     } catch (e) {
       cy.layout({ name: 'grid', rows: Math.ceil(Math.sqrt(g.nodes.length || 1)) }).run();
     }
     await fetchLibrary();
     buildLibraryFromCy();
   }
-  // Ensure class colors applied on (re)load
-  applyClassColors();
-  // Re-add staged edges as green overlays
-  renderStagedEdges();
-  renderStagedAdds();
+  cy.batch(() => {
+    // Ensure class colors applied on (re)load
+    resetClassColors();
+    applyClassColors();
+    // Re-add staged edges as green overlays
+    renderStagedEdges();
+    renderStagedAdds();
+  });
   statusEl.textContent = '';
 }
 
 function isObject(v) { return v && typeof v === 'object' && !Array.isArray(v); }
 
+// Pretty-printed JSON per param object; node data is replaced on every graph load, so entries never go stale
+const prettyJsonCache = new WeakMap();
+function prettyJson(value){
+  let text = prettyJsonCache.get(value);
+  if (text === undefined) {
+    text = JSON.stringify(value, null, 2);
+    prettyJsonCache.set(value, text);
+  }
+  return text;
+}
+
 function buildField(key, value) {
   const wrap = document.createElement('div');
   wrap.className = 'field';
@@ -795,7 +1342,7 @@ function buildField(key, value) {
     const ta = document.createElement('textarea');
     ta.rows = 6;
     ta.id = `f_${key}`;
-    ta.value = JSON.stringify(value, null, 2);
+    ta.value = prettyJson(value);
     ta.dataset.type = 'json';
     // Make ref_* fields droppable
     if (typeof key === 'string' && key.startsWith('ref_')) {
@@ -834,12 +1381,13 @@ function onNodeTap(evt) {
   modalTitle.textContent = `Edit: ${currentNodeData.func} [${currentNodeData.cls}]`;
   nodeMeta.innerHTML = `<span class="muted">module: <code>${escapeHtml(currentNodeData.full)}</code> — index: ${currentNodeData.index}</span>`;
 
-  formGrid.innerHTML = '';
   const params = currentNodeData.params || {};
   // Show everything (including ref_* and outputs) so you can edit freely
+  const frag = document.createDocumentFragment();
   Object.keys(params).forEach((key) => {
-    formGrid.appendChild(buildField(key, params[key]));
+    frag.appendChild(buildField(key, params[key]));
   });
+  formGrid.replaceChildren(frag);
 
   openModal(currentNode);
   // Render outputs for this node only
@@ -917,7 +1465,7 @@ seqSelect.addEventListener('dblclick', async () => {
   try {
     if (!seqSelect.value) return;
     const id = Number(seqSelect.value);
-    const currentName = Array.from(seqSelect.options).find(o => Number(o.value) === id)?.textContent?.split(' — ')[1] || '';
+    const currentName = seqNameById.get(id) || '';
     const name = prompt('Rename sequence:', currentName);
     if (!name) return;
     const res = await fetch('/sequence/rename', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ id, name }) });
@@ -990,13 +1538,8 @@ function makeDroppable(el, key) {
       order: 0
     };
     // If it's a textarea showing json, pretty print
-    if (el.tagName === 'TEXTAREA') {
-      el.value = JSON.stringify(refObj, null, 2);
-      el.dataset.type = 'json';
-    } else {
-      el.value = JSON.stringify(refObj);
-      el.dataset.type = 'json';
-    }
+    el.value = JSON.stringify(refObj, null, el.tagName === 'TEXTAREA' ? 2 : undefined);
+    el.dataset.type = 'json';
   });
 }
 
@@ -1008,29 +1551,34 @@ function getDnDData(e){
 }
 
 // ---- Class color mapping (unique per class) ----
-function buildUniqueClassPalette(){
-  if (!cy) return {};
-  const classes = [];
-  cy.nodes().forEach(n => { const c = n.data('cls'); if (c) classes.push(c); });
-  const uniq = Array.from(new Set(classes));
-  const palette = {};
-  // Golden-angle hue stepping for well-distributed unique hues
-  for (let i = 0; i < uniq.length; i++) {
+// cls -> color, assigned in first-seen order; reset by loadGraph so each graph starts from hue 0
+let classColorCache = { map: new Map(), nextIndex: 0 };
+function resetClassColors(){
+  classColorCache = { map: new Map(), nextIndex: 0 };
+}
+function classColor(cls){
+  let color = classColorCache.map.get(cls);
+  if (color === undefined) {
+    const i = classColorCache.nextIndex++;
+    // Golden-angle hue stepping for well-distributed unique hues
     const hue = (i * 137.508) % 360; // keep decimal to avoid collisions
     // Vary saturation/lightness a bit over cycles to keep contrast with many classes
     const sat = 65 + ((i % 3) * 7); // 65,72,79
     const light = 35 + (Math.floor(i / 3) % 2) * 8; // 35,43,35,43...
-    palette[uniq[i]] = `hsl(${hue}, ${sat}%, ${light}%)`;
+    color = `hsl(${hue}, ${sat}%, ${light}%)`;
+    classColorCache.map.set(cls, color);
   }
-  return palette;
+  return color;
 }
 function applyClassColors(){
   if (!cy) return;
-  const palette = buildUniqueClassPalette();
-  cy.nodes().forEach(n => {
-    const cls = n.data('cls');
-    const color = cls ? (palette[cls] || '#374151') : '#374151';
-    n.data('cls_color', color);
+  cy.batch(() => {
+    cy.nodes().forEach(n => {
+      const cls = n.data('cls');
+      const color = cls ? classColor(cls) : '#374151';
+      // Skip unchanged nodes so a refresh doesn't restyle the whole graph
+      if (n.data('cls_color') !== color) n.data('cls_color', color);
+    });
   });
 }
 
@@ -1057,21 +1605,22 @@ if (chooseIOConfigBtn) chooseIOConfigBtn.addEventListener('click', async () => {
 let pendingLink = null; // { source_index, source_func, output_name, target_index }
 function nodeAtRenderedPoint(rx, ry){
   if (!cy) return null;
-  let found = null;
-  cy.nodes().forEach(n => {
-    const bb = n.renderedBoundingBox();
-    if (rx >= bb.x1 && rx <= bb.x2 && ry >= bb.y1 && ry <= bb.y2) {
-      found = n;
-    }
-  });
-  return found;
+  // Walk backwards and stop at the first hit: the last matching node is the one drawn on top
+  const nodes = cy.nodes();
+  for (let i = nodes.length - 1; i >= 0; i--) {
+    const bb = nodes[i].renderedBoundingBox();
+    if (rx >= bb.x1 && rx <= bb.x2 && ry >= bb.y1 && ry <= bb.y2) return nodes[i];
+  }
+  return null;
 }
 
 function openLinker(source, targetNode){
   pendingLink = { ...source, target_index: targetNode.data('index') };
   // Fill selects
   linkerSourceOutput.innerHTML = '';
-  const srcNode = cy.nodes().filter(n => (n.data('index')||-1) === source.source_index)[0];
+  // Graph node ids are n<index>
+  const srcById = cy.getElementById(`n${source.source_index}`);
+  const srcNode = srcById.nonempty() ? srcById : null;
   const srcOuts = (srcNode && srcNode.data('outputs')) || [];
   srcOuts.forEach(o => {
     const opt = document.createElement('option');
@@ -1115,10 +1664,14 @@ linkerApply.addEventListener('click', async () => {
 });
 
 // ---- Staged edges rendering and save bar ----
+// How many staged overlays the last render added; may overcount after a reload wiped them, never undercounts
+let renderedStagedEdges = 0;
+let renderedStagedNodes = 0;
+
 function renderStagedEdges(){
   if (!cy) return;
-  // remove previous staged edges
-  cy.edges('[edge_type = "staged"]').remove();
+  // Common case: nothing staged and nothing drawn, so skip the selector scan over every edge
+  if (!stagedLinks.length && !renderedStagedEdges) return;
   const toAdd = stagedLinks.map((l, i) => ({
     group: 'edges',
     data: {
@@ -1129,13 +1682,18 @@ function renderStagedEdges(){
       edge_type: 'staged'
     }
   }));
-  if (toAdd.length) cy.add(toAdd);
+  // One style/render pass for the swap
+  cy.batch(() => {
+    // remove previous staged edges
+    cy.edges('[edge_type = "staged"]').remove();
+    if (toAdd.length) cy.add(toAdd);
+  });
+  renderedStagedEdges = toAdd.length;
 }
 
 function renderStagedAdds(){
   if (!cy) return;
-  // remove previous staged nodes
-  cy.nodes('[staged]').remove();
+  if (!stagedAdds.length && !renderedStagedNodes) return;
   const toAdd = stagedAdds.map(a => ({
     group: 'nodes',
     data: {
@@ -1152,27 +1710,40 @@ function renderStagedAdds(){
       h: 48
     }
   }));
-  if (toAdd.length) {
-    const eles = cy.add(toAdd);
-    eles.forEach((n, idx) => {
-      n.position({ x: 0, y: stagedAdds[idx].dropY });
-    });
-    applyClassColors();
-  }
+  // One style/render pass for the swap, positions and colors
+  cy.batch(() => {
+    // remove previous staged nodes
+    cy.nodes('[staged]').remove();
+    if (toAdd.length) {
+      const eles = cy.add(toAdd);
+      eles.forEach((n, idx) => {
+        n.position({ x: 0, y: stagedAdds[idx].dropY });
+      });
+      applyClassColors();
+    }
+  });
+  renderedStagedNodes = toAdd.length;
 }
 
+// payload is the drop's own freshly parsed DnD JSON, so its params can be kept without copying
 function addStagedNodeAt(payload, dropY){
   const staged_id = `sn${++stagedAddCounter}`;
-  const outs = (library.classToModules[payload.cls]?.find(m => m.func === payload.func)?.outputs) || [];
+  const outs = libraryModule(payload.cls, payload.func)?.outputs || [];
   const desiredIndex = computeDesiredInsertionIndex(dropY);
-  stagedAdds.push({ staged_id, full: payload.full, cls: payload.cls, func: payload.func, params: JSON.parse(JSON.stringify(payload.params || {})), dropY, outputs: outs, desiredIndex });
+  stagedAdds.push({ staged_id, full: payload.full, cls: payload.cls, func: payload.func, params: payload.params || {}, dropY, outputs: outs, desiredIndex });
   renderStagedAdds();
   updateSaveBarVisibility();
 }
 
+// cy.nodes('[!staged]'), kept until an element is added or removed
+let nonStagedCache = null;
+function nonStagedNodes(){
+  return nonStagedCache || (nonStagedCache = cy.nodes('[!staged]'));
+}
+
 function computeDesiredInsertionIndex(dropY){
   if (!cy) return 0;
-  const existing = cy.nodes('[!staged]');
+  const existing = nonStagedNodes();
   if (!existing || existing.length === 0) return 0;
   // Count how many existing node centers are above the drop point
   let count = 0;
@@ -1208,10 +1779,25 @@ function setupReorderDrag(){
   cy.on('free', 'node', onNodeDragReleased);
 }
 
+// Debounced: a burst of 'free' events (multi-node moves) diffs the order once, on the last one
+let reorderTimer = null;
 function onNodeDragReleased(){
+  clearTimeout(reorderTimer);
+  reorderTimer = setTimeout(updateStagedReorder, 150);
+}
+
+// Run a pending reorder diff now (before saving) instead of waiting for the timer
+function flushStagedReorder(){
+  if (reorderTimer === null) return;
+  updateStagedReorder();
+}
+
+function updateStagedReorder(){
+  clearTimeout(reorderTimer);
+  reorderTimer = null;
   const order = computeCurrentOrderFromPositions();
-  const original = computeOriginalOrder();
-  if (!arraysEqual(order, original)) {
+  // The original order is just the indices sorted, so any descent means the user reordered
+  if (!isNonDecreasing(order)) {
     stagedReorder = order;
   } else {
     stagedReorder = null;
@@ -1221,26 +1807,15 @@ function onNodeDragReleased(){
 
 function computeCurrentOrderFromPositions(){
   if (!cy) return [];
-  const nodes = cy.nodes('[!staged]');
+  const nodes = nonStagedNodes();
   const list = [];
   nodes.forEach(n => { list.push({ y: n.renderedPosition().y, idx: n.data('index')||0 }); });
   list.sort((a,b) => a.y - b.y);
   return list.map(e => e.idx);
 }
 
-function computeOriginalOrder(){
-  if (!cy) return [];
-  const nodes = cy.nodes('[!staged]');
-  const list = [];
-  nodes.forEach(n => { list.push({ idx: n.data('index')||0 }); });
-  list.sort((a,b) => (a.idx - b.idx));
-  return list.map(e => e.idx);
-}
-
-function arraysEqual(a,b){
-  if (!Array.isArray(a) || !Array.isArray(b)) return false;
-  if (a.length !== b.length) return false;
-  for (let i=0;i<a.length;i++){ if (a[i] !== b[i]) return false; }
+function isNonDecreasing(a){
+  for (let i=1;i<a.length;i++){ if (a[i-1] > a[i]) return false; }
   return true;
 }
 
@@ -1260,6 +1835,8 @@ function updateSaveBarVisibility(){
 }
 
 discardStagedBtn.addEventListener('click', () => {
+  clearTimeout(reorderTimer);
+  reorderTimer = null;
   stagedLinks = [];
   stagedAdds = [];
   stagedReorder = null;
@@ -1270,6 +1847,7 @@ discardStagedBtn.addEventListener('click', () => {
 });
 
 async function applyStagedChanges({ thenSaveAs } = { thenSaveAs: false }){
+  flushStagedReorder();
   if (!stagedLinks.length && !stagedAdds.length && !stagedReorder) {
     if (thenSaveAs) await saveAsConfig();
     return;
@@ -1301,12 +1879,12 @@ async function applyStagedChanges({ thenSaveAs } = { thenSaveAs: false }){
       });
       const payloads = Object.values(groups);
       if (payloads.length) {
-        const results = await Promise.all(payloads.map(g => fetch('/update', {
+        // One request for all groups: the config is loaded and saved once
+        const resB = await fetch('/update_batch', {
           method: 'POST', headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ sequence_id: currentSeqId, node_index: g.node_index, updates: g.updates })
-        })));
-        const firstBad = results.find(r => !r.ok);
-        if (firstBad) throw new Error(await firstBad.text());
+          body: JSON.stringify({ sequence_id: currentSeqId, groups: payloads })
+        });
+        if (!resB.ok) throw new Error(await resB.text());
       }
     }
 
@@ -1337,8 +1915,7 @@ applyStagedBtn.addEventListener('click', async () => { await applyStagedChanges(
 function clearStagedLinks(){
   stagedLinks = [];
   stagedAdds = [];
-  renderStagedEdges();
-  renderStagedAdds();
+  if (cy) cy.batch(() => { renderStagedEdges(); renderStagedAdds(); });
   updateSaveBarVisibility();
 }
 
@@ -1355,11 +1932,11 @@ function setupCyDnD(){
     const rect = container.getBoundingClientRect();
     const rx = e.clientX - rect.left; // rendered coords
     const ry = e.clientY - rect.top;
-    const target = nodeAtRenderedPoint(rx, ry);
     if (data.kind === 'lib_node') {
       addStagedNodeAt(data, ry);
       return;
     }
+    const target = nodeAtRenderedPoint(rx, ry);
     if (!target) return;
     // If dropping onto the same node, ignore
     if ((target.data('index')||-1) === data.source_index) return;
@@ -1368,7 +1945,7 @@ function setupCyDnD(){
 }
 
 // ---- Right-click drag to connect (red arrow overlay) ----
-let dragOverlay = null; // { svg, line, onMouseMove, onMouseUp }
+let dragOverlay = null; // { svg, arrow, onMouseMove, onMouseUp, blockCtx, onViewport, raf }
 function setupRightDrag(){
   if (!cy) return;
   const container = cy.container();
@@ -1409,31 +1986,46 @@ function beginRightDrag(sourceNode){
   marker.appendChild(path);
   defs.appendChild(marker);
   svg.appendChild(defs);
-  const line = document.createElementNS('http://www.w3.org/2000/svg', 'line');
-  line.setAttribute('stroke', '#b91c1c');
-  line.setAttribute('stroke-width', '3');
-  line.setAttribute('x1', '0'); line.setAttribute('y1', '0');
-  line.setAttribute('x2', '0'); line.setAttribute('y2', '0');
-  line.setAttribute('marker-end', 'url(#arrowhead)');
-  svg.appendChild(line);
+  // A path rather than a line: the whole geometry is one 'd' attribute, so each redraw is a single DOM write
+  const arrow = document.createElementNS('http://www.w3.org/2000/svg', 'path');
+  arrow.setAttribute('stroke', '#b91c1c');
+  arrow.setAttribute('stroke-width', '3');
+  arrow.setAttribute('fill', 'none');
+  arrow.setAttribute('d', 'M0 0 L0 0');
+  arrow.setAttribute('marker-end', 'url(#arrowhead)');
+  svg.appendChild(arrow);
   container.style.position = 'relative';
   container.appendChild(svg);
 
+  // Container origin and source position are fixed for the drag unless the viewport moves;
+  // reading them per event would force a synchronous layout each time
+  let rect = container.getBoundingClientRect();
+  let src = sourceNode.renderedPosition();
+  const onViewport = () => {
+    rect = container.getBoundingClientRect();
+    src = sourceNode.renderedPosition();
+  };
+  cy.on('pan zoom', onViewport);
+
   const update = (clientX, clientY) => {
-    const src = sourceNode.renderedPosition();
-    line.setAttribute('x1', String(src.x));
-    line.setAttribute('y1', String(src.y));
-    const rect = container.getBoundingClientRect();
     const rx = clientX - rect.left;
     const ry = clientY - rect.top;
-    line.setAttribute('x2', String(rx));
-    line.setAttribute('y2', String(ry));
+    arrow.setAttribute('d', `M${src.x} ${src.y} L${rx} ${ry}`);
   };
 
-  const onMouseMove = (e) => { update(e.clientX, e.clientY); };
+  // mousemove fires faster than the screen repaints; draw at most once per frame with the latest point
+  let lastX = 0, lastY = 0;
+  const onMouseMove = (e) => {
+    lastX = e.clientX; lastY = e.clientY;
+    if (dragOverlay && !dragOverlay.raf) {
+      dragOverlay.raf = requestAnimationFrame(() => {
+        if (dragOverlay) dragOverlay.raf = 0;
+        update(lastX, lastY);
+      });
+    }
+  };
   const onMouseUp = (e) => {
     e.preventDefault();
-    const rect = container.getBoundingClientRect();
     const rx = e.clientX - rect.left;
     const ry = e.clientY - rect.top;
     const target = nodeAtRenderedPoint(rx, ry);
@@ -1444,17 +2036,20 @@ function beginRightDrag(sourceNode){
     }
   };
 
-  document.addEventListener('mousemove', onMouseMove);
+  // Passive: the handler never calls preventDefault (mouseup does, so it stays non-passive)
+  document.addEventListener('mousemove', onMouseMove, { passive: true });
   document.addEventListener('mouseup', onMouseUp, { once: true });
-  dragOverlay = { svg, line, onMouseMove, onMouseUp, blockCtx };
+  dragOverlay = { svg, arrow, onMouseMove, onMouseUp, blockCtx, onViewport, raf: 0 };
   // Seed start position
-  const lastMouse = cy.renderer().mouseLocation || { x: sourceNode.renderedPosition().x, y: sourceNode.renderedPosition().y };
-  update(lastMouse.x || sourceNode.renderedPosition().x, lastMouse.y || sourceNode.renderedPosition().y);
+  const lastMouse = cy.renderer().mouseLocation || { x: src.x, y: src.y };
+  update(lastMouse.x || src.x, lastMouse.y || src.y);
 }
 
 function endRightDrag(){
   if (!dragOverlay) return;
   document.removeEventListener('mousemove', dragOverlay.onMouseMove);
+  if (dragOverlay.raf) cancelAnimationFrame(dragOverlay.raf);
+  if (cy) cy.off('pan zoom', dragOverlay.onViewport);
   const toRemove = dragOverlay.blockCtx;
   try { dragOverlay.svg.remove(); } catch {}
   dragOverlay = null;
@@ -1473,10 +2068,7 @@ async function fetchLibrary(){
       const map = library.classToModules || {};
       Object.keys(payload.classes).forEach(cls => {
         map[cls] = map[cls] || [];
-        const existingFuncs = new Set(map[cls].map(m => m.func));
-        payload.classes[cls].forEach(m => {
-          if (!existingFuncs.has(m.func)) map[cls].push(m);
-        });
+        payload.classes[cls].forEach(m => addLibraryModule(map, cls, m));
       });
       library.classToModules = map;
       // refresh UI
@@ -1495,7 +2087,9 @@ async function fetchLibrary(){
 
 function buildLibraryFromCy(){
   if (!cy) return;
-  const merged = library.classToModules ? JSON.parse(JSON.stringify(library.classToModules)) : {};
+  // Only the per-class arrays are pushed to below, so copying that level is enough
+  const merged = {};
+  for (const c in library.classToModules) merged[c] = library.classToModules[c].slice();
   cy.nodes().forEach(n => {
     if (n.data('staged')) return;
     const cls = n.data('cls') || '';
@@ -1504,10 +2098,7 @@ function buildLibraryFromCy(){
     const params = n.data('params') || {};
     const outputs = n.data('outputs') || [];
     if (!cls || !func) return;
-    merged[cls] = merged[cls] || [];
-    if (!merged[cls].some(m => m.func === func)) {
-      merged[cls].push({ func, full, params, outputs });
-    }
+    if (!libraryModule(cls, func)) addLibraryModule(merged, cls, { func, full, params, outputs });
   });
   library.classToModules = merged;
   // populate class select
@@ -1527,6 +2118,8 @@ function renderLibraryModules(){
   libBody.innerHTML = '';
   if (!cls) return;
   const mods = library.classToModules[cls] || [];
+  // Build every card off-document and insert them in one go
+  const frag = document.createDocumentFragment();
   mods.forEach(m => {
     const card = document.createElement('div');
     card.className = 'lib-card';
@@ -1552,8 +2145,9 @@ function renderLibraryModules(){
       e.dataTransfer.setData('application/json', JSON.stringify(payload));
       e.dataTransfer.effectAllowed = 'copy';
     });
-    libBody.appendChild(card);
+    frag.appendChild(card);
   });
+  libBody.appendChild(frag);
 }
 
 async function fetchConfigSection(section){
@@ -1565,7 +2159,6 @@ async function fetchConfigSection(section){
 }
 
 function renderSectionEditor(sectionName, data){
-  libBody.innerHTML = '';
   const form = document.createElement('div');
   form.className = 'grid';
   const obj = data || {};
@@ -1614,8 +2207,7 @@ function renderSectionEditor(sectionName, data){
     alert('Saved.');
   });
   row.appendChild(save);
-  libBody.appendChild(form);
-  libBody.appendChild(row);
+  libBody.replaceChildren(form, row);
 }
 
 async function switchRightPanel(mode){
@@ -1636,7 +2228,7 @@ function showLibraryDetails(cls, m){
   currentNode = null; currentNodeData = null;
   modalTitle.textContent = `Template: ${m.func} [${cls}]`;
   nodeMeta.innerHTML = `<span class="muted">module: <code>${escapeHtml(m.full)}</code></span>`;
-  formGrid.innerHTML = '';
+  const frag = document.createDocumentFragment();
   // Outputs section
   const outputsSection = document.createElement('div'); outputsSection.className = 'field';
   const outputsLabel = document.createElement('label'); outputsLabel.textContent = 'Outputs'; outputsSection.appendChild(outputsLabel);
@@ -1645,15 +2237,16 @@ function showLibraryDetails(cls, m){
   if (outs.length) { outs.forEach(o => { const chip = document.createElement('span'); chip.className = 'pill'; chip.textContent = o; outputsBox.appendChild(chip); }); }
   else { const none = document.createElement('span'); none.className = 'muted'; none.textContent = 'No outputs detected'; outputsBox.appendChild(none); }
   outputsSection.appendChild(outputsBox);
-  formGrid.appendChild(outputsSection);
+  frag.appendChild(outputsSection);
   const params = m.params || {};
   Object.keys(params).forEach((key) => {
     const v = params[key];
     const wrap = document.createElement('div'); wrap.className = 'field';
     const label = document.createElement('label'); label.textContent = key; wrap.appendChild(label);
-    const pre = document.createElement('textarea'); pre.rows = 4; pre.value = JSON.stringify(v, null, 2); pre.readOnly = true; wrap.appendChild(pre);
-    formGrid.appendChild(wrap);
+    const pre = document.createElement('textarea'); pre.rows = 4; pre.value = isObject(v) || Array.isArray(v) ? prettyJson(v) : JSON.stringify(v, null, 2); pre.readOnly = true; wrap.appendChild(pre);
+    frag.appendChild(wrap);
   });
+  formGrid.replaceChildren(frag);
   openModal(null);
 }
 
@@ -1671,12 +2264,31 @@ function showLibraryDetails(cls, m){
 </script>
 </body>
 </html>
-    """
-    return Response(html, mimetype="text/html")
+    """.encode("utf-8")
+_INDEX_ETAG = hashlib.blake2b(_INDEX_HTML, digest_size=8).hexdigest()
+# Compressed once at import; served as-is to clients that accept gzip
+_INDEX_HTML_GZ = gzip.compress(_INDEX_HTML, 9, mtime=0)
+
+@app.get("/")
+def index() -> Response:
+    if request.accept_encodings["gzip"]:
+        resp = Response(_INDEX_HTML_GZ, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+        # Distinct validator per representation
+        resp.set_etag(_INDEX_ETAG + "-gz")
+    else:
+        resp = Response(_INDEX_HTML, mimetype="text/html")
+        resp.set_etag(_INDEX_ETAG)
+    resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    # Always revalidate: a refresh costs one 304, and a restarted app with new markup is picked up at once
+    resp.cache_control.max_age = 0
+    # Answers If-None-Match with an empty 304
+    return resp.make_conditional(request)
 
 @app.get("/sequences")
 def sequences():
-    docs = load_all_docs(get_config_path())
+    docs = load_all_docs_fast(get_config_path())
     _, seq_doc = find_doc_by_section(docs, "SequenceConfig")
     seqs = get_sequences(seq_doc)
 
@@ -1688,10 +2300,10 @@ def sequences():
             "name": s.get("name", None)
         })
 
-    return jsonify({
-        "config_path": str(Path(get_config_path()).resolve()),
+    return conditional_json(dumps_json({
+        "config_path": get_config_path_resolved(),
         "sequences": out
-    })
+    }), docs)
 
 @app.get("/library")
 def get_library():
@@ -1707,9 +2319,7 @@ def get_library():
         yaml_files = sorted(list(lib_dir.glob("*.yml")) + list(lib_dir.glob("*.yaml")))
         for yf in yaml_files:
             try:
-                raw = yf.read_text(encoding="utf-8")
-                rendered = render_jinja_text(raw, yf.parent)
-                docs = list(yaml.load_all(StringIO(rendered)))
+                docs = load_all_docs_fast(str(yf))
             except Exception:
                 continue
             # find sequences across all docs and build outputs by function
@@ -1754,7 +2364,7 @@ def get_library():
                         if not any(e.get("func") == func for e in classes[cls]):
                             classes[cls].append(entry)
 
-    return jsonify({"classes": classes, "dir": str(lib_dir.resolve())})
+    return ojson({"classes": classes, "dir": str(lib_dir.resolve())})
 
 @app.post("/set_config")
 def set_config():
@@ -1840,31 +2450,36 @@ def dialog_save_as():
 @app.get("/graph")
 def graph():
     seq_id = request.args.get("sequence", default=None, type=str)
-    docs = load_all_docs(get_config_path())
+    # Optional paging: only modules[offset:offset+limit] (limit <= 0 means all)
+    offset = max(0, request.args.get("offset", default=0, type=int))
+    limit = request.args.get("limit", default=0, type=int)
+    docs = load_all_docs_fast(get_config_path())
     _, seq_doc = find_doc_by_section(docs, "SequenceConfig")
     seqs = get_sequences(seq_doc)
 
-    # pick sequence by explicit id string/int if provided, else first
-    sequence = None
-    if seq_id is not None:
-        # try to match either int or string equality on 'id'
-        for s in seqs:
-            sid = s.get("id")
-            if str(sid) == str(seq_id):
-                sequence = s
-                break
-    if sequence is None:
-        sequence = seqs[0]
-
-    g = build_graph_from_sequence(sequence)
-    return jsonify(g)
+    # Serialized graphs live on the cache entry, so they are rebuilt only when the file changes
+    memo = _doc_memo(docs)
+    graphs = memo.setdefault("graph_json", {}) if memo is not None else {}
+    key = (seq_id, offset, limit)
+    body = graphs.get(key)
+    if body is None:
+        # pick sequence by explicit id string/int if provided, else first
+        _, sequence = find_sequence(docs, seqs, seq_id)
+        window = (offset, offset + limit if limit > 0 else None) if (offset or limit > 0) else None
+        g = build_graph_from_sequence(sequence, window)
+        body = dumps_json(g)
+        # Bounded: paging makes the key space open-ended, so evict the oldest entry first
+        if len(graphs) >= GRAPH_MEMO_MAX:
+            del graphs[next(iter(graphs))]
+        graphs[key] = body
+    return conditional_json(body, docs, *key)
 
 @app.get("/config_section")
 def get_config_section():
     name = request.args.get("name", type=str)
     if not name:
         return Response("name is required", status=400)
-    docs = load_all_docs(get_config_path())
+    docs = load_all_docs_fast(get_config_path())
     try:
         _, section = find_doc_by_section(docs, name)
     except Exception:
@@ -1874,6 +2489,7 @@ def get_config_section():
     return jsonify({"data": data})
 
 @app.post("/config_section")
+@_serialized
 def set_config_section():
     body = request.get_json(force=True) or {}
     name = body.get("name")
@@ -1898,7 +2514,50 @@ def set_config_section():
     save_all_docs(get_config_path(), docs)
     return jsonify({"ok": True})
 
+def _read_json_body() -> Tuple[Any, Optional[Response]]:
+    """Parse a bounded JSON object body; returns (data, None) or (None, error response)."""
+    # Reject pathological payloads before they are parsed into Python objects
+    if (request.content_length or 0) > MAX_UPDATE_BYTES:
+        return None, Response("request body too large", status=413)
+    raw = request.get_data(cache=False)
+    if len(raw) > MAX_UPDATE_BYTES:
+        return None, Response("request body too large", status=413)
+    try:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (ValueError, RecursionError):
+        return None, Response("invalid JSON body", status=400)
+    if not isinstance(data, dict):
+        return None, Response("body must be an object", status=400)
+    return data, None
+
+def _apply_node_updates(node: dict, updates: dict, undo: List[Tuple[dict, str, bool, Any]]) -> bool:
+    """
+    Apply updates with type coercion based on existing values; returns whether anything changed.
+    Each assignment is first recorded in undo as (node, key, existed, old value).
+    """
+    changed = False
+    for k, new_val in updates.items():
+        old_val = node.get(k, None)
+        new_val = coerce_value(new_val, old_val)
+        # Equal values are left alone, which also keeps ruamel's original quoting/number format.
+        # True == 1 in Python, so a bool/non-bool switch still counts as a change.
+        if k in node and new_val == old_val and isinstance(new_val, bool) == isinstance(old_val, bool):
+            continue
+        undo.append((node, k, k in node, old_val))
+        node[k] = new_val
+        changed = True
+    return changed
+
+def _undo_node_updates(undo: List[Tuple[dict, str, bool, Any]]) -> None:
+    # Restore the original value objects, newest first, so ruamel keeps their original formatting
+    for node, k, existed, old_val in reversed(undo):
+        if existed:
+            node[k] = old_val
+        else:
+            node.pop(k, None)
+
 @app.post("/update")
+@_serialized
 def update_node():
     """
     Body: {
@@ -1907,48 +2566,113 @@ def update_node():
       updates: { "param": "new value", "filter_size": "13", "simulate": "false", ... }
     }
     """
-    data = request.get_json(force=True)
+    data, err = _read_json_body()
+    if err is not None:
+        return err
     seq_id = data.get("sequence_id")
     node_index = data.get("node_index")
     updates = data.get("updates", {})
 
     if node_index is None:
         return Response("node_index is required", status=400)
-
-    docs = load_all_docs(get_config_path())
+    try:
+        idx = int(node_index)
+    except (TypeError, ValueError):
+        return Response("node_index must be an integer", status=400)
+    if not isinstance(updates, dict):
+        return Response("updates must be an object", status=400)
+    if len(updates) > MAX_UPDATE_KEYS:
+        return Response(f"too many updates (max {MAX_UPDATE_KEYS})", status=400)
+
+    # Single-node edit: patch the cached tree directly instead of deep-copying the whole config
+    path = get_config_path()
+    docs = _edit_docs_in_place(path)
     seq_doc_idx, seq_doc = find_doc_by_section(docs, "SequenceConfig")
     seqs = get_sequences(seq_doc)
 
     # choose sequence
-    sequence = None
-    sequence_idx = 0
-    if seq_id is not None:
-        for i, s in enumerate(seqs):
-            if str(s.get("id")) == str(seq_id):
-                sequence = s
-                sequence_idx = i
-                break
-    if sequence is None:
-        sequence = seqs[0]
-        sequence_idx = 0
+    _, sequence = find_sequence(docs, seqs, seq_id)
 
     modules = sequence.get("module_sequence", [])
-    if not (0 <= int(node_index) < len(modules)):
+    if not (0 <= idx < len(modules)):
         return Response("node_index out of range", status=400)
 
-    node = modules[int(node_index)]
-    # Apply updates with type coercion based on existing values
-    for k, new_val in updates.items():
-        old_val = node.get(k, None)
-        node[k] = coerce_value(new_val, old_val)
+    undo: List[Tuple[dict, str, bool, Any]] = []
+    try:
+        changed = _apply_node_updates(modules[idx], updates, undo)
+    except Exception:
+        # Flushing or dropping the shared tree would save or lose earlier pending edits; undo ours
+        _undo_node_updates(undo)
+        raise
+    if not changed:
+        # Re-sent values (blur events, resubmits): nothing to write
+        return ojson({"ok": True, "node_index": node_index, "noop": True})
+    # Persist shortly; only the SequenceConfig document is re-emitted
+    schedule_save(path, docs, seq_doc_idx)
+
+    return ojson({"ok": True, "node_index": node_index})
+
+@app.post("/update_batch")
+@_serialized
+def update_nodes_batch():
+    """
+    Body: {
+      sequence_id: 0,
+      groups: [ { node_index: 3, updates: {...} }, { node_index: 5, updates: {...} }, ... ]
+    }
+    Same semantics as /update per group, but the config is loaded and saved once.
+    All groups are validated before anything is applied.
+    """
+    data, err = _read_json_body()
+    if err is not None:
+        return err
+    seq_id = data.get("sequence_id")
+    groups = data.get("groups", [])
+    if not isinstance(groups, list):
+        return Response("groups must be a list", status=400)
 
-    # Persist back
-    docs[seq_doc_idx]["sequences"][sequence_idx]["module_sequence"][int(node_index)] = node
-    save_all_docs(get_config_path(), docs)
+    path = get_config_path()
+    docs = _edit_docs_in_place(path)
+    seq_doc_idx, seq_doc = find_doc_by_section(docs, "SequenceConfig")
+    seqs = get_sequences(seq_doc)
+    _, sequence = find_sequence(docs, seqs, seq_id)
+    modules = sequence.get("module_sequence", [])
 
-    return jsonify({"ok": True, "node_index": node_index})
+    planned = []
+    total_updates = 0
+    for g in groups:
+        if not isinstance(g, dict) or g.get("node_index") is None:
+            return Response("each group needs a node_index", status=400)
+        updates = g.get("updates", {})
+        if not isinstance(updates, dict):
+            return Response("updates must be an object", status=400)
+        try:
+            idx = int(g["node_index"])
+        except (TypeError, ValueError):
+            return Response("node_index must be an integer", status=400)
+        if not (0 <= idx < len(modules)):
+            return Response("node_index out of range", status=400)
+        total_updates += len(updates)
+        if total_updates > MAX_UPDATE_KEYS:
+            return Response(f"too many updates (max {MAX_UPDATE_KEYS})", status=400)
+        planned.append((idx, updates))
+
+    changed = False
+    undo: List[Tuple[dict, str, bool, Any]] = []
+    try:
+        for idx, updates in planned:
+            changed = _apply_node_updates(modules[idx], updates, undo) or changed
+    except Exception:
+        # All-or-nothing: roll back every group applied so far
+        _undo_node_updates(undo)
+        raise
+    if changed:
+        schedule_save(path, docs, seq_doc_idx)
+
+    return ojson({"ok": True, "node_indices": [idx for idx, _ in planned]})
 
 @app.post("/add_nodes")
+@_serialized
 def add_nodes():
     """
     Body: {
@@ -1971,17 +2695,7 @@ def add_nodes():
     seqs = get_sequences(seq_doc)
 
     # choose sequence
-    sequence = None
-    sequence_idx = 0
-    if seq_id is not None:
-        for i, s in enumerate(seqs):
-            if str(s.get("id")) == str(seq_id):
-                sequence = s
-                sequence_idx = i
-                break
-    if sequence is None:
-        sequence = seqs[0]
-        sequence_idx = 0
+    sequence_idx, sequence = find_sequence(docs, seqs, seq_id)
 
     modules = sequence.get("module_sequence", [])
     if not isinstance(modules, list):
@@ -2020,6 +2734,7 @@ def add_nodes():
     return jsonify({"ok": True, "assigned_indices": assigned})
 
 @app.post("/reorder_nodes")
+@_serialized
 def reorder_nodes():
     """
     Body: {
@@ -2040,17 +2755,7 @@ def reorder_nodes():
     seqs = get_sequences(seq_doc)
 
     # choose sequence
-    sequence = None
-    sequence_idx = 0
-    if seq_id is not None:
-        for i, s in enumerate(seqs):
-            if str(s.get("id")) == str(seq_id):
-                sequence = s
-                sequence_idx = i
-                break
-    if sequence is None:
-        sequence = seqs[0]
-        sequence_idx = 0
+    sequence_idx, sequence = find_sequence(docs, seqs, seq_id)
 
     modules = sequence.get("module_sequence", [])
     if not isinstance(modules, list):
@@ -2077,6 +2782,7 @@ def reorder_nodes():
     return jsonify({"ok": True, "count": len(reordered)})
 
 @app.post("/delete_nodes")
+@_serialized
 def delete_nodes():
     """
     Body: {
@@ -2097,17 +2803,7 @@ def delete_nodes():
     seqs = get_sequences(seq_doc)
 
     # choose sequence
-    sequence = None
-    sequence_idx = 0
-    if seq_id is not None:
-        for i, s in enumerate(seqs):
-            if str(s.get("id")) == str(seq_id):
-                sequence = s
-                sequence_idx = i
-                break
-    if sequence is None:
-        sequence = seqs[0]
-        sequence_idx = 0
+    sequence_idx, sequence = find_sequence(docs, seqs, seq_id)
 
     modules = sequence.get("module_sequence", [])
     if not isinstance(modules, list):
@@ -2127,46 +2823,23 @@ def delete_nodes():
 
     return jsonify({"ok": True, "remaining": len(modules)})
 
-@app.post("/sequence/create")
-def sequence_create():
-    """
-    Body: { kind: "blank" | "copy", source_id?: int, name?: str }
-    Creates a new sequence. For kind="copy", copies the module_sequence from source_id.
-    Assigns a new unique id (one plus max existing id) and uses optional name or a default.
-    Returns: { ok: True, new_id: int }
-    """
-    data = request.get_json(force=True) or {}
-    kind = (data.get("kind") or "blank").lower()
-    source_id = data.get("source_id")
-    custom_name = data.get("name")
-
-    docs = load_all_docs(get_config_path())
-    seq_doc_idx, seq_doc = find_doc_by_section(docs, "SequenceConfig")
-    seqs = get_sequences(seq_doc)
-
-    # Choose new id
+def _next_sequence_id(seqs: List[dict]) -> int:
     existing_ids = []
     for s in seqs:
         try:
             existing_ids.append(int(s.get("id", 0)))
         except Exception:
             continue
-    new_id = (max(existing_ids) + 1) if existing_ids else 0
+    return (max(existing_ids) + 1) if existing_ids else 0
 
+def _make_sequence(docs: List[CommentedMap], seqs: List[dict], new_id: int, kind: str,
+                   source_id: Any, custom_name: Any) -> Dict[str, Any]:
+    """New sequence dict: blank, or for kind="copy" a deep copy of source_id's modules (and name)."""
     new_seq: Dict[str, Any] = {"id": new_id, "name": custom_name or f"Sequence {new_id}", "interval": 0, "module_sequence": []}
 
     if kind == "copy":
-        # Find source by id match
-        src = None
-        if source_id is not None:
-            for s in seqs:
-                if str(s.get("id")) == str(source_id):
-                    src = s
-                    break
-        if src is None and seqs:
-            src = seqs[0]
-        if src is None:
-            return Response("no source sequence to copy", status=400)
+        # Find source by id match, else the first sequence
+        _, src = find_sequence(docs, seqs, source_id)
         # Deep copy modules
         try:
             src_modules = src.get("module_sequence", [])
@@ -2181,6 +2854,28 @@ def sequence_create():
                     new_seq["name"] = src_name.strip()
             except Exception:
                 pass
+    return new_seq
+
+@app.post("/sequence/create")
+@_serialized
+def sequence_create():
+    """
+    Body: { kind: "blank" | "copy", source_id?: int, name?: str }
+    Creates a new sequence. For kind="copy", copies the module_sequence from source_id.
+    Assigns a new unique id (one plus max existing id) and uses optional name or a default.
+    Returns: { ok: True, new_id: int }
+    """
+    data = request.get_json(force=True) or {}
+    kind = (data.get("kind") or "blank").lower()
+    source_id = data.get("source_id")
+    custom_name = data.get("name")
+
+    docs = load_all_docs(get_config_path())
+    seq_doc_idx, seq_doc = find_doc_by_section(docs, "SequenceConfig")
+    seqs = get_sequences(seq_doc)
+
+    new_id = _next_sequence_id(seqs)
+    new_seq = _make_sequence(docs, seqs, new_id, kind, source_id, custom_name)
 
     # Append and persist
     docs[seq_doc_idx]["sequences"].append(new_seq)
@@ -2188,7 +2883,39 @@ def sequence_create():
 
     return jsonify({"ok": True, "new_id": new_id})
 
+@app.post("/sequence/create_many")
+@_serialized
+def sequence_create_many():
+    """
+    Body: { kind: "blank" | "copy", source_id?: int, count: int }
+    Same as calling /sequence/create `count` times, with a single load and save.
+    Returns: { ok: True, ids: [int, ...], next_selected_id: int }
+    """
+    data = request.get_json(force=True) or {}
+    kind = (data.get("kind") or "blank").lower()
+    source_id = data.get("source_id")
+    try:
+        count = int(data.get("count", 1))
+    except (TypeError, ValueError):
+        return Response("count must be an integer", status=400)
+    if not (1 <= count <= MAX_BULK_SEQUENCES):
+        return Response(f"count must be between 1 and {MAX_BULK_SEQUENCES}", status=400)
+
+    docs = load_all_docs(get_config_path())
+    seq_doc_idx, seq_doc = find_doc_by_section(docs, "SequenceConfig")
+    seqs = get_sequences(seq_doc)
+
+    # Build every copy from the unmodified source before appending, like sequential creates would
+    first_id = _next_sequence_id(seqs)
+    ids = list(range(first_id, first_id + count))
+    new_seqs = [_make_sequence(docs, seqs, new_id, kind, source_id, None) for new_id in ids]
+    docs[seq_doc_idx]["sequences"].extend(new_seqs)
+    save_all_docs(get_config_path(), docs)
+
+    return jsonify({"ok": True, "ids": ids, "next_selected_id": ids[-1]})
+
 @app.post("/sequence/delete")
+@_serialized
 def sequence_delete():
     """
     Body: { id: int }
@@ -2236,6 +2963,7 @@ def sequence_delete():
     return jsonify({"ok": True, "next_selected_id": next_id})
 
 @app.post("/sequence/rename")
+@_serialized
 def sequence_rename():
     """
     Body: { id: int, name: str }
@@ -2266,4 +2994,13 @@ def sequence_rename():
     return jsonify({"ok": True})
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Serve with waitress (multi-threaded, no debugger) when installed; ROCKIQ_DEV=1 keeps the
+    # Werkzeug dev server with the debugger and auto-reload
+    try:
+        from waitress import serve
+    except Exception:
+        serve = None  # type: ignore
+    if serve is not None and not os.environ.get("ROCKIQ_DEV"):
+        serve(app, host="127.0.0.1", port=5000, threads=8)
+    else:
+        app.run(debug=True)
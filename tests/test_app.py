@@ -0,0 +1,174 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app as graph_app
+from ruamel.yaml import YAML
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+BASE_CONFIG = (REPO_DIR / "configtest.yml").read_text(encoding="utf-8")
+LIBRARY_CONFIG = "FrothIQ Sockets NX AsyncNet- Tested.yml"
+
+
+class ConfigTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.old_path = graph_app.get_config_path()
+        self.addCleanup(self.restore_config)
+        self.client = graph_app.app.test_client()
+
+    def restore_config(self):
+        graph_app.reset_caches()
+        graph_app.set_config_path(self.old_path)
+
+    def use_config(self, text, name="config.yml"):
+        path = os.path.join(self.tmp, name)
+        Path(path).write_text(text, encoding="utf-8")
+        graph_app.set_config_path(path)
+        graph_app.reset_caches()
+        return path
+
+    def post(self, url, body):
+        res = self.client.post(url, json=body)
+        self.assertEqual(res.status_code, 200, res.get_data(as_text=True))
+        return res
+
+    def assert_sequences_intact(self, path):
+        graph_app._flush_pending_saves()
+        text = Path(path).read_text(encoding="utf-8")
+        docs = list(YAML().load_all(text))
+        seq_doc = next(d for d in docs if d.get("section") == "SequenceConfig")
+        self.assertIsInstance(seq_doc["sequences"], list)
+        self.assertTrue(seq_doc["sequences"])
+        self.assertEqual(self.client.get("/graph?sequence=0").status_code, 200)
+        return text
+
+
+class SaveRoundTripTests(ConfigTestCase):
+    def test_repeated_saves_keep_blank_line_before_first_sequence(self):
+        path = self.use_config(BASE_CONFIG.replace("sequences:\n- id: 0", "sequences:\n\n- id: 0"))
+        for name in ("first", "second", "third"):
+            self.post("/sequence/rename", {"id": 0, "name": name})
+        self.assert_sequences_intact(path)
+
+    def test_structural_save_after_update_keeps_comment(self):
+        path = self.use_config(BASE_CONFIG.replace("sequences:\n- id: 0", "sequences:\n# main pipeline\n- id: 0"))
+        self.post("/update", {"sequence_id": 0, "node_index": 0, "updates": {"fps": "25"}})
+        graph_app._flush_pending_saves()
+        self.post("/sequence/rename", {"id": 0, "name": "renamed"})
+        text = self.assert_sequences_intact(path)
+        self.assertIn("# main pipeline", text)
+
+    def test_jinja_library_config_survives_update_then_add_nodes(self):
+        shutil.copytree(REPO_DIR / "library", self.tmp, dirs_exist_ok=True)
+        path = os.path.join(self.tmp, LIBRARY_CONFIG)
+        graph_app.set_config_path(path)
+        graph_app.reset_caches()
+        self.post("/update", {"sequence_id": 0, "node_index": 0, "updates": {"name": "renamed"}})
+        self.post("/add_nodes", {"sequence_id": 0, "inserts": [{"index": 0, "node": {"module": "cFoo.Bar"}}]})
+        graph_app.reset_caches()
+        self.assertEqual(self.client.get("/graph?sequence=0").status_code, 200)
+
+
+class InPlaceUpdateTests(ConfigTestCase):
+    def test_structural_edits_after_update_keep_file_valid(self):
+        for marker in ("\n", "# main pipeline\n"):
+            with self.subTest(marker=marker):
+                path = self.use_config(BASE_CONFIG.replace("sequences:\n- id: 0", "sequences:\n" + marker + "- id: 0"))
+                self.post("/update", {"sequence_id": 0, "node_index": 0, "updates": {"fps": "24"}})
+                self.post("/sequence/create", {"kind": "copy", "source_id": 0})
+                self.post("/update", {"sequence_id": 1, "node_index": 1, "updates": {"name": "copy"}})
+                self.post("/sequence/rename", {"id": 1, "name": "second"})
+                self.post("/update", {"sequence_id": 0, "node_index": 0, "updates": {"fps": "23"}})
+                count = len(self.client.get("/graph?sequence=0").get_json()["nodes"])
+                self.post("/reorder_nodes", {"sequence_id": 0, "new_order": list(range(count))[::-1]})
+                self.post("/delete_nodes", {"sequence_id": 1, "indices": [0]})
+                self.assert_sequences_intact(path)
+
+    def test_written_tree_is_not_reused(self):
+        path = self.use_config(BASE_CONFIG)
+        self.post("/update", {"sequence_id": 0, "node_index": 0, "updates": {"fps": "24"}})
+        with graph_app._DOCS_LOCK:
+            edited = graph_app._edit_docs_in_place(path)
+            graph_app._flush_pending_saves()
+            self.assertIsNot(graph_app._edit_docs_in_place(path), edited)
+
+    def test_save_reseeds_cache_without_reading_the_file(self):
+        path = self.use_config(BASE_CONFIG.replace("sequences:\n- id: 0", "sequences:\n# main pipeline\n- id: 0"))
+        self.post("/sequence/rename", {"id": 0, "name": "renamed"})
+        original_read_text = Path.read_text
+        def no_read(p, *args, **kwargs):
+            if os.path.abspath(p) == os.path.abspath(path):
+                raise AssertionError("config re-read after save")
+            return original_read_text(p, *args, **kwargs)
+        with unittest.mock.patch.object(Path, "read_text", no_read):
+            self.post("/update", {"sequence_id": 0, "node_index": 0, "updates": {"fps": "24"}})
+        self.post("/sequence/rename", {"id": 0, "name": "again"})
+        text = self.assert_sequences_intact(path)
+        self.assertIn("# main pipeline", text)
+
+
+class UpdateValidationTests(ConfigTestCase):
+    def test_update_rejects_non_integer_node_index(self):
+        self.use_config(BASE_CONFIG)
+        for bad in ("abc", [1], {"i": 1}):
+            with self.subTest(node_index=bad):
+                res = self.client.post("/update", json={"sequence_id": 0, "node_index": bad, "updates": {"fps": "24"}})
+                self.assertEqual(res.status_code, 400)
+                self.assertEqual(res.get_data(as_text=True), "node_index must be an integer")
+
+    def test_failed_update_is_rolled_back_and_earlier_pending_edit_kept(self):
+        path = self.use_config(BASE_CONFIG)
+        self.post("/update", {"sequence_id": 0, "node_index": 0, "updates": {"fps": "24"}})
+        original_coerce = graph_app.coerce_value
+        def failing_coerce(new_val, old_val):
+            if new_val == "boom":
+                raise RuntimeError("coercion failed")
+            return original_coerce(new_val, old_val)
+        for url, body in (
+            ("/update", {"sequence_id": 0, "node_index": 0, "updates": {"name": "half", "zz_extra": "boom"}}),
+            ("/update_batch", {"sequence_id": 0, "groups": [
+                {"node_index": 0, "updates": {"name": "half"}},
+                {"node_index": 1, "updates": {"added": "x", "zz_extra": "boom"}}]}),
+        ):
+            with self.subTest(url=url), unittest.mock.patch.object(graph_app, "coerce_value", failing_coerce):
+                self.assertEqual(self.client.post(url, json=body).status_code, 500)
+        graph_app._flush_pending_saves()
+        docs = list(YAML().load_all(Path(path).read_text(encoding="utf-8")))
+        modules = next(d for d in docs if d.get("section") == "SequenceConfig")["sequences"][0]["module_sequence"]
+        self.assertEqual(modules[0]["fps"], 24)
+        self.assertEqual(modules[0]["name"], "Camera 0")
+        self.assertNotIn("zz_extra", modules[0])
+        self.assertNotIn("added", modules[1])
+
+
+class JinjaIncludeTests(ConfigTestCase):
+    def plant_name(self):
+        return self.client.get("/config_section?name=PlantInfo").get_json()["data"]["plant_name"]
+
+    def test_edits_to_included_file_are_picked_up(self):
+        Path(self.tmp, "plant.txt").write_text("First", encoding="utf-8")
+        self.use_config(BASE_CONFIG.replace("plant_name: Molycop-Massawa", 'plant_name: {% include "plant.txt" %}'))
+        self.assertEqual(self.plant_name(), "First")
+        Path(self.tmp, "plant.txt").write_text("Second plant", encoding="utf-8")
+        self.assertEqual(self.plant_name(), "Second plant")
+
+
+class JsonResponseTests(ConfigTestCase):
+    def test_graph_serializes_integers_wider_than_64_bits(self):
+        self.use_config(BASE_CONFIG.replace("    fps: 30\n", "    fps: 30\n    serial: 123456789012345678901234\n", 1))
+        res = self.client.get("/graph?sequence=0")
+        self.assertEqual(res.status_code, 200)
+        params = res.get_json()["nodes"][0]["data"]["params"]
+        self.assertEqual(params["serial"], 123456789012345678901234)
+
+
+if __name__ == "__main__":
+    unittest.main()